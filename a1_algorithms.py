@@ -14,7 +14,8 @@ methods) given in the starter code, but you can definitely add new attributes
 and methods to complete your work here.
 """
 import csv
-from python_ta.contracts import check_contracts
+from typing import Iterator, Optional, TextIO
+from a1_contracts import check_contracts
 
 from a1_entities import Person, Elevator
 
@@ -63,6 +64,28 @@ class ArrivalGenerator:
         """
         raise NotImplementedError
 
+    def generate_range(self, start: int,
+                       stop: int) -> dict[int, dict[int, list[Person]]]:
+        """Return the new arrivals for every round from start (inclusive) to
+        stop (exclusive), mapping each round number to what generate would
+        return for that round.
+
+        Only rounds with at least one new arrival are included in the
+        returned dictionary.
+
+        Subclasses may override this method to generate a block of rounds
+        more efficiently than one call to generate per round.
+
+        Preconditions:
+        - 0 <= start <= stop
+        """
+        arrivals = {}
+        for round_num in range(start, stop):
+            new_arrivals = self.generate(round_num)
+            if new_arrivals:
+                arrivals[round_num] = new_arrivals
+        return arrivals
+
 
 @check_contracts
 class SingleArrivals(ArrivalGenerator):
@@ -109,20 +132,42 @@ class SingleArrivals(ArrivalGenerator):
         True
         >>> print(my_arrivals[1])
         [Person(start=1, target=2, wait_time=0)]
+        >>> print(my_generator.generate(4)[1])
+        [Person(start=1, target=3, wait_time=0)]
         """
-        new_person = Person(1, 2)
-        new_arrivals = {1: [new_person]}
-        if round_num == 0:
-            return new_arrivals
-        else:
-            j = 0
-            for i in range(round_num):
-                j += i
-                if new_person.target != self.max_floor:
-                    new_person.target += 1
-                else:
-                    new_person.target = 2
-            return new_arrivals
+        return {1: [Person(1, self._target_floor(round_num))]}
+
+    def generate_range(self, start: int,
+                       stop: int) -> dict[int, dict[int, list[Person]]]:
+        """Return the new arrivals for every round from start (inclusive) to
+        stop (exclusive), mapping each round number to what generate would
+        return for that round.
+
+        Preconditions:
+        - 0 <= start <= stop
+
+        >>> my_generator = SingleArrivals(4)
+        >>> my_arrivals = my_generator.generate_range(2, 4)
+        >>> sorted(my_arrivals)
+        [2, 3]
+        >>> print(my_arrivals[2][1])
+        [Person(start=1, target=4, wait_time=0)]
+        >>> print(my_arrivals[3][1])
+        [Person(start=1, target=2, wait_time=0)]
+        """
+        period = self.max_floor - 1
+        return {
+            round_num: {1: [Person(1, 2 + round_num % period)]}
+            for round_num in range(start, stop)
+        }
+
+    def _target_floor(self, round_num: int) -> int:
+        """Return the target floor of the person generated at round_num.
+
+        Targets cycle through floors 2 to self.max_floor, so this is
+        computed directly rather than by stepping through every round.
+        """
+        return 2 + round_num % (self.max_floor - 1)
 
 
 @check_contracts
@@ -138,10 +183,15 @@ class FileArrivals(ArrivalGenerator):
     We have provided some sample CSV files under the data/ folder.
     """
     arrival_data: dict[int, list[Person]]  # keys are round #s (not floor #)
+    # For each round # in arrival_data, its people grouped by starting floor
+    _arrivals_by_floor: dict[int, dict[int, list[Person]]]
 
     def __init__(self, max_floor: int, filename: str) -> None:
         """Initialize a new FileArrivals algorithm from the given file.
 
+        Each round's people are grouped by starting floor here, once, so
+        that generate is just a lookup.
+
         Preconditions:
         - <filename> refers to a valid CSV file, following the specified
           format and restrictions from the assignment handout.
@@ -155,17 +205,7 @@ class FileArrivals(ArrivalGenerator):
         with open(filename) as csvfile:
             reader = csv.reader(csvfile)
             for line in reader:  # each round (line)
-                round_num = int(line[0])
-                start_floor = []
-                target_floor = []
-                people = []
-                for i in range(1, len(line), 2):  # start floor of people
-                    start_floor.append(line[i])
-                for j in range(2, len(line), 2):  # target floor of people
-                    target_floor.append(line[j])
-                for start, target in zip(start_floor, target_floor):
-                    new_person = Person(int(start), int(target))
-                    people.append(new_person)
+                round_num, people = _parse_arrival_line(line)
                 self.arrival_data[round_num] = people
 
         # sort the arrival data by round number
@@ -174,6 +214,10 @@ class FileArrivals(ArrivalGenerator):
             for k in sorted(self.arrival_data)
         }
         self.arrival_data = sorted_arrival_data
+        self._arrivals_by_floor = {
+            round_num: group_by_start_floor(people)
+            for round_num, people in self.arrival_data.items()
+        }
 
     def generate(self, round_num: int) -> dict[int, list[Person]]:
         """Return the new arrivals for the simulation at the given round.
@@ -186,6 +230,9 @@ class FileArrivals(ArrivalGenerator):
         in the returned dictionary. In other words, there should not be
         any empty lists in the returned dictionary.
 
+        The returned dictionary is shared between calls for the same round,
+        so it must not be mutated.
+
         Preconditions:
         - round_num >= 0
 
@@ -198,27 +245,116 @@ class FileArrivals(ArrivalGenerator):
         >>> print(round0_arrivals[5])
         [Person(start=5, target=3, wait_time=0)]
         """
-        new_arrivals = {}
+        return self._arrivals_by_floor.get(round_num, {})
 
-        # Ensure that round_num exists in arrival_data
-        if round_num in self.arrival_data:
-            arrivals_for_round = self.arrival_data[round_num]
 
-            # Group people by their starting floor
-            people_by_start_floor = {}
-            for person in arrivals_for_round:
-                start_floor = person.start
-                if start_floor not in people_by_start_floor:
-                    people_by_start_floor[start_floor] = []
-                people_by_start_floor[start_floor].append(person)
+@check_contracts
+class StreamingFileArrivals(ArrivalGenerator):
+    """Generate arrivals from a CSV file, reading it lazily as rounds advance.
+
+    Unlike FileArrivals, the file is never loaded into memory all at once:
+    each call to generate only parses the lines up to the requested round,
+    and at most one parsed line (the next round with arrivals) is kept
+    buffered. The file is closed once it has been read to the end.
 
-            # Sort people within each starting floor
-            # group by their original order of appearance
-            for start_floor, people in people_by_start_floor.items():
-                sorted_people = sorted(people, key=arrivals_for_round.index)
-                new_arrivals[start_floor] = sorted_people
+    The file must follow the same format as for FileArrivals, with the
+    additional restriction that its lines are sorted by round number and no
+    round number appears on more than one line.
 
-        return new_arrivals
+    generate must be called with strictly increasing round numbers; rounds
+    that are skipped over are discarded.
+    """
+    _file: TextIO
+    _reader: Iterator[list[str]]
+    _next_round: Optional[tuple[int, list[Person]]]
+
+    def __init__(self, max_floor: int, filename: str) -> None:
+        """Initialize a new StreamingFileArrivals algorithm for the given file.
+
+        Preconditions:
+        - <filename> refers to a valid CSV file, following the specified
+          format and restrictions from the assignment handout, with its lines
+          sorted by round number.
+        """
+        ArrivalGenerator.__init__(self, max_floor)
+        self._file = open(filename)
+        self._reader = csv.reader(self._file)
+        self._next_round = None
+        self._read_next_round()
+
+    def generate(self, round_num: int) -> dict[int, list[Person]]:
+        """Return the new arrivals for the simulation at the given round.
+
+        People with the same starting floor are listed in the order they
+        appear in the file.
+
+        Preconditions:
+        - round_num >= 0
+        - round_num is greater than the round_num of every previous call
+
+        >>> my_generator = StreamingFileArrivals(5, 'data/sample_arrivals.csv')
+        >>> round0_arrivals = my_generator.generate(0)
+        >>> print(round0_arrivals[1])
+        [Person(start=1, target=4, wait_time=0)]
+        >>> print(round0_arrivals[5])
+        [Person(start=5, target=3, wait_time=0)]
+        >>> my_generator.generate(1)
+        {}
+        >>> print(my_generator.generate(2))
+        {1: [Person(start=1, target=2, wait_time=0)]}
+        """
+        while self._next_round is not None and self._next_round[0] < round_num:
+            self._read_next_round()
+
+        if self._next_round is None or self._next_round[0] != round_num:
+            return {}
+
+        people = self._next_round[1]
+        self._read_next_round()
+        return group_by_start_floor(people)
+
+    def close(self) -> None:
+        """Close the underlying file, discarding any rounds not yet read."""
+        self._file.close()
+        self._next_round = None
+
+    def _read_next_round(self) -> None:
+        """Parse the next non-empty line of the file into self._next_round.
+
+        Set self._next_round to None (and close the file) if there are no
+        lines left.
+        """
+        for line in self._reader:
+            if line:
+                self._next_round = _parse_arrival_line(line)
+                return
+        self.close()
+
+
+def _parse_arrival_line(line: list[str]) -> tuple[int, list[Person]]:
+    """Return the round number and the people arriving in that round, from
+    one line of an arrivals CSV file.
+
+    People are returned in the order they appear in the line.
+    """
+    round_num = int(line[0])
+    people = [Person(int(start), int(target))
+              for start, target in zip(line[1::2], line[2::2])]
+    return round_num, people
+
+
+def group_by_start_floor(people: list[Person]) -> dict[int, list[Person]]:
+    """Return people grouped by their starting floor, in one pass.
+
+    Within each floor, people keep the order they have in the given list.
+    """
+    people_by_start_floor = {}
+    for person in people:
+        if person.start in people_by_start_floor:
+            people_by_start_floor[person.start].append(person)
+        else:
+            people_by_start_floor[person.start] = [person]
+    return people_by_start_floor
 
 
 ###############################################################################
@@ -374,8 +510,9 @@ if __name__ == '__main__':
     # below and press "Ctrl + /" or "⌘ + /".
     import python_ta
     python_ta.check_all(config={
-        'allowed-io': ['FileArrivals.__init__'],
-        'extra-imports': ['a1_entities', 'csv'],
+        'allowed-io': ['FileArrivals.__init__',
+                       'StreamingFileArrivals.__init__'],
+        'extra-imports': ['a1_contracts', 'a1_entities', 'csv', 'typing'],
         'max-nested-blocks': 4,
         'max-line-length': 100
     })
@@ -0,0 +1,405 @@
+"""CSC148 Assignment 1 - Array-based simulation engine
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module description ===
+This contains ArraySimulation, an alternative to Simulation that stores every
+rider in NumPy arrays (one entry per rider, "struct of arrays") instead of
+one Person object per rider, and runs the same five stages each round with
+vectorized operations. It accepts the same configuration dictionary as
+Simulation and reports the same statistics, but never visualizes.
+
+Only the EndToEndLoop and FurthestFloor moving algorithms are supported,
+since ArraySimulation reimplements them on its arrays.
+
+This module requires NumPy, which the rest of the simulation does not.
+"""
+from typing import Any
+
+import numpy as np
+from a1_contracts import check_contracts
+
+import a1_algorithms
+from a1_entities import set_headless
+from a1_histograms import ODWaitHistograms
+
+# Rider states (values of ArraySimulation._state)
+WAITING = 0
+RIDING = 1
+DONE = 2
+
+# The number of rounds of arrivals fetched from the arrival generator at once
+ARRIVAL_BLOCK_SIZE = 1024
+# The initial number of riders ArraySimulation has room for
+_INITIAL_RIDERS = 1024
+
+
+@check_contracts
+class ArraySimulation:
+    """A simulation that stores its riders in NumPy arrays.
+
+    Riders are stored in the order they arrived, so the riders waiting on a
+    floor, in order of index, form that floor's waiting queue. Completed
+    riders are counted and then dropped from the arrays.
+
+    Instance Attributes:
+    - arrival_generator: the algorithm used to generate new arrivals.
+    - moving_algorithm: the algorithm used to decide how to move elevators
+    - num_floors: the number of floors
+    - num_rounds: the number of rounds run
+    - total_people: the number of people that have arrived
+    - people_completed: the number of people that have disembarked
+    - wait_histograms: histograms of the wait times of completed people, by
+        start and target floor
+
+    Representation Invariants:
+    - self.num_floors >= 2
+    - len(self._current_floors) >= 1
+    - self.total_people >= self.people_completed >= 0
+    - 0 <= self._num_riders <= len(self._start)
+    """
+    arrival_generator: a1_algorithms.ArrivalGenerator
+    moving_algorithm: a1_algorithms.MovingAlgorithm
+    num_floors: int
+    num_rounds: int
+    total_people: int
+    people_completed: int
+    wait_histograms: ODWaitHistograms
+    # Elevators: one entry per elevator, in the same order as Simulation's
+    _capacity: int
+    _current_floors: np.ndarray
+    _target_floors: np.ndarray
+    # Riders: entries 0 to self._num_riders - 1 are in use
+    _num_riders: int
+    _start: np.ndarray
+    _target: np.ndarray
+    _wait_time: np.ndarray
+    _state: np.ndarray
+    _elevator: np.ndarray  # -1 while not riding
+    _board_order: np.ndarray  # boarding sequence number while riding
+    _num_boarded: int
+    # Arrivals fetched ahead of time from the arrival generator
+    _arrivals: dict[int, dict[int, list[Any]]]
+    _arrivals_stop: int
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Initialize a new array simulation using the given configuration.
+
+        config['visualize'] is ignored: this simulation is always headless.
+
+        Preconditions:
+        - config is a dictionary in the format found on the assignment handout
+        - config['num_floors'] >= 2
+        - config['elevator_capacity'] >= 1
+        - config['num_elevators'] >= 1
+        - config['moving_algorithm'] is an EndToEndLoop or FurthestFloor
+        """
+        set_headless(True)
+        self.arrival_generator = config['arrival_generator']
+        self.moving_algorithm = config['moving_algorithm']
+        self.num_floors = config['num_floors']
+        self.num_rounds = 0
+        self.total_people = 0
+        self.people_completed = 0
+        self.wait_histograms = ODWaitHistograms()
+
+        self._capacity = config['elevator_capacity']
+        self._current_floors = np.ones(config['num_elevators'], dtype=np.int64)
+        self._target_floors = np.ones(config['num_elevators'], dtype=np.int64)
+
+        self._num_riders = 0
+        self._start = np.zeros(_INITIAL_RIDERS, dtype=np.int64)
+        self._target = np.zeros(_INITIAL_RIDERS, dtype=np.int64)
+        self._wait_time = np.zeros(_INITIAL_RIDERS, dtype=np.int64)
+        self._state = np.zeros(_INITIAL_RIDERS, dtype=np.int8)
+        self._elevator = np.full(_INITIAL_RIDERS, -1, dtype=np.int64)
+        self._board_order = np.zeros(_INITIAL_RIDERS, dtype=np.int64)
+        self._num_boarded = 0
+
+        self._arrivals = {}
+        self._arrivals_stop = 0
+
+    ############################################################################
+    # Handle rounds of simulation.
+    ############################################################################
+    def run(self, num_rounds: int) -> dict[str, int]:
+        """Run the simulation for the given number of rounds.
+
+        Return the same set of statistics as Simulation.run.
+
+        Preconditions:
+        - num_rounds >= 1
+        - This method is only called once for each ArraySimulation instance
+        """
+        self.num_rounds = num_rounds
+        for i in range(num_rounds):
+            # Stage 1: elevator disembarking
+            self.handle_disembarking()
+
+            # Stage 2: new arrivals
+            self.generate_arrivals(i)
+
+            # Stage 3: elevator boarding
+            self.handle_boarding()
+
+            # Stage 4: move the elevators
+            self.move_elevators()
+
+            # Stage 5: update wait times
+            self.update_wait_times()
+
+        return self._calculate_stats()
+
+    def handle_disembarking(self) -> None:
+        """Handle people leaving elevators.
+
+        As in Simulation, every passenger of an elevator that has reached its
+        target floor disembarks.
+        """
+        arrived = np.flatnonzero(self._current_floors == self._target_floors)
+        if len(arrived) == 0:
+            return
+
+        n = self._num_riders
+        leaving = (self._state[:n] == RIDING) & \
+            np.isin(self._elevator[:n], arrived)
+        num_leaving = int(np.count_nonzero(leaving))
+        if num_leaving == 0:
+            return
+
+        for start, target, wait_time in zip(self._start[:n][leaving].tolist(),
+                                            self._target[:n][leaving].tolist(),
+                                            self._wait_time[:n][leaving].tolist()):
+            self.wait_histograms.record(start, target, wait_time)
+        self._state[:n][leaving] = DONE
+        self._elevator[:n][leaving] = -1
+        self.people_completed += num_leaving
+        if 2 * (self.people_completed - (self.total_people - n)) > n:
+            self._drop_completed()
+
+    def generate_arrivals(self, round_num: int) -> None:
+        """Add the new arrivals for round_num to the end of the arrays.
+
+        Arrivals are fetched from the arrival generator ARRIVAL_BLOCK_SIZE
+        rounds at a time (see ArrivalGenerator.generate_range).
+        """
+        if round_num >= self._arrivals_stop:
+            self._arrivals_stop = max(
+                min(round_num + ARRIVAL_BLOCK_SIZE, self.num_rounds),
+                round_num + 1)
+            self._arrivals = self.arrival_generator.generate_range(
+                round_num, self._arrivals_stop)
+        new_arrivals = self._arrivals.pop(round_num, {})
+
+        starts = []
+        targets = []
+        for floor in new_arrivals:
+            for person in new_arrivals[floor]:
+                starts.append(floor)
+                targets.append(person.target)
+        if not starts:
+            return
+
+        n = self._num_riders
+        self._reserve(n + len(starts))
+        self._start[n:n + len(starts)] = starts
+        self._target[n:n + len(starts)] = targets
+        self._wait_time[n:n + len(starts)] = 0
+        self._state[n:n + len(starts)] = WAITING
+        self._elevator[n:n + len(starts)] = -1
+        self._num_riders = n + len(starts)
+        self.total_people += len(starts)
+
+    def handle_boarding(self) -> None:
+        """Handle boarding of people.
+
+        This follows Simulation.handle_boarding exactly: elevators on the same
+        floor board in order, each taking the people at the front of that
+        floor's queue who are going its way (anyone, if it is idle) until it
+        is full.
+        """
+        n = self._num_riders
+        waiting = np.flatnonzero(self._state[:n] == WAITING)
+        if len(waiting) == 0:
+            return
+
+        riding = self._state[:n] == RIDING
+        rooms = self._capacity - np.bincount(
+            self._elevator[:n][riding], minlength=len(self._current_floors))
+        for floor in np.unique(self._current_floors):
+            queue = waiting[self._start[waiting] == floor]
+            for elevator in np.flatnonzero(self._current_floors == floor):
+                if len(queue) == 0:
+                    break
+                queue = self._board(int(elevator), int(rooms[elevator]),
+                                    queue)
+
+    def move_elevators(self) -> None:
+        """Update elevator target floors and then move them."""
+        if isinstance(self.moving_algorithm, a1_algorithms.EndToEndLoop):
+            self._update_end_to_end_loop()
+        elif isinstance(self.moving_algorithm, a1_algorithms.FurthestFloor):
+            self._update_furthest_floor()
+        else:
+            raise ValueError(f'ArraySimulation does not support '
+                             f'{type(self.moving_algorithm).__name__}')
+
+        self._current_floors += np.sign(self._target_floors
+                                        - self._current_floors)
+
+    def update_wait_times(self) -> None:
+        """Update the waiting time for every person waiting in this simulation,
+        including passengers on an elevator.
+        """
+        n = self._num_riders
+        self._wait_time[:n][self._state[:n] != DONE] += 1
+
+    ############################################################################
+    # Statistics calculations
+    ############################################################################
+    def _calculate_stats(self) -> dict[str, int]:
+        """Report the statistics for the current run of this simulation.
+
+        These are computed the same way as in Simulation._calculate_stats;
+        in particular, max_time and avg_time are 0 if nobody is waiting.
+
+        Preconditions:
+        - This method is only called after the simulation rounds have finished
+        """
+        n = self._num_riders
+        times = self._wait_time[:n][self._state[:n] == WAITING]
+        if len(times) == 0:
+            max_time = 0
+            avg_time = 0
+        else:
+            max_time = int(times.max())
+            avg_time = int(times.sum()) // len(times)
+
+        return {
+            'num_rounds': self.num_rounds,
+            'total_people': self.total_people,
+            'people_completed': self.people_completed,
+            'max_time': max_time,
+            'avg_time': avg_time
+        }
+
+    ############################################################################
+    # Helpers
+    ############################################################################
+    def _board(self, elevator: int, room: int,
+               queue: np.ndarray) -> np.ndarray:
+        """Board people from queue (the riders waiting on this elevator's
+        floor, in order) onto the given elevator, which has room for room
+        more passengers, and return the riders left in queue.
+        """
+        if room <= 0:
+            return queue
+
+        current = self._current_floors[elevator]
+        target = self._target_floors[elevator]
+        if current < target:
+            eligible = self._target[queue] > current
+        elif current > target:
+            eligible = self._target[queue] < current
+        else:
+            eligible = np.ones(len(queue), dtype=bool)
+
+        boarding = np.flatnonzero(eligible)[:room]
+        if len(boarding) == 0:
+            return queue
+
+        riders = queue[boarding]
+        self._state[riders] = RIDING
+        self._elevator[riders] = elevator
+        self._board_order[riders] = np.arange(
+            self._num_boarded, self._num_boarded + len(riders))
+        self._num_boarded += len(riders)
+        return np.delete(queue, boarding)
+
+    def _update_end_to_end_loop(self) -> None:
+        """Update the elevator target floors as EndToEndLoop does.
+
+        Like EndToEndLoop.update_target_floors, stop at the first elevator
+        that is on neither the bottom nor the top floor.
+        """
+        at_end = (self._current_floors == 1) | \
+            (self._current_floors == self.num_floors)
+        num_updated = len(at_end) if at_end.all() else int(np.argmin(at_end))
+        current = self._current_floors[:num_updated]
+        self._target_floors[:num_updated] = np.where(
+            current == 1, self.num_floors, 1)
+
+    def _update_furthest_floor(self) -> None:
+        """Update the elevator target floors as FurthestFloor does."""
+        n = self._num_riders
+        riding = np.flatnonzero(self._state[:n] == RIDING)
+        elevators = self._elevator[riding]
+
+        # Case 1: head for the furthest passenger target (the first such
+        # passenger to board, if there is a tie)
+        if len(riding) > 0:
+            distances = np.abs(self._target[riding]
+                               - self._current_floors[elevators])
+            order = np.lexsort((self._board_order[riding], -distances,
+                                elevators))
+            firsts = order[np.r_[True, elevators[order][1:]
+                                 != elevators[order][:-1]]]
+            self._target_floors[elevators[firsts]] = self._target[
+                riding[firsts]]
+
+        # Case 2: idle and empty elevators head for the furthest floor with
+        # someone waiting (the lowest such floor, if there is a tie)
+        empty = np.bincount(elevators, minlength=len(self._current_floors)) == 0
+        idle = np.flatnonzero(
+            empty & (self._current_floors == self._target_floors))
+        if len(idle) == 0:
+            return
+        waiting_floors = np.flatnonzero(np.bincount(
+            self._start[:n][self._state[:n] == WAITING],
+            minlength=self.num_floors + 1))
+        if len(waiting_floors) == 0:
+            return
+        distances = np.abs(waiting_floors[np.newaxis, :]
+                           - self._current_floors[idle][:, np.newaxis])
+        self._target_floors[idle] = waiting_floors[np.argmax(distances, axis=1)]
+
+    def _reserve(self, num_riders: int) -> None:
+        """Make sure the rider arrays have room for num_riders riders."""
+        size = len(self._start)
+        if num_riders <= size:
+            return
+        while size < num_riders:
+            size *= 2
+        self._start = np.resize(self._start, size)
+        self._target = np.resize(self._target, size)
+        self._wait_time = np.resize(self._wait_time, size)
+        self._state = np.resize(self._state, size)
+        self._elevator = np.resize(self._elevator, size)
+        self._board_order = np.resize(self._board_order, size)
+
+    def _drop_completed(self) -> None:
+        """Remove completed riders from the arrays, keeping the order of the
+        remaining riders.
+        """
+        n = self._num_riders
+        keep = np.flatnonzero(self._state[:n] != DONE)
+        for array in (self._start, self._target, self._wait_time, self._state,
+                      self._elevator, self._board_order):
+            array[:len(keep)] = array[keep]
+        self._num_riders = len(keep)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'extra-imports': ['a1_contracts', 'a1_entities', 'a1_algorithms',
+                          'a1_histograms', 'numpy'],
+        'max-nested-blocks': 4,
+        'max-attributes': 20,
+        'max-line-length': 100
+    })
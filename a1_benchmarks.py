@@ -0,0 +1,217 @@
+"""CSC148 Assignment 1 - Benchmarks
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module Description ===
+
+This file contains benchmarks for the simulation. They always run headless
+(config['visualize'] is False), and are run from the command line, e.g.:
+
+    python a1_benchmarks.py contracts --rounds 2000
+    A1_PRODUCTION=1 python a1_benchmarks.py lobby --rounds 500
+
+Each benchmark prints its results as JSON. Except for the contracts
+benchmark, benchmarks run in the current process, so set A1_PRODUCTION (see
+a1_contracts) to time them without contract checking.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+from a1_contracts import PRODUCTION_ENV_VAR, is_production_mode
+from a1_algorithms import ArrivalGenerator, SingleArrivals, EndToEndLoop, \
+    FurthestFloor
+from a1_entities import Person
+from a1_simulation import Simulation
+
+# The five stages of Simulation.run, in the order they run each round
+STAGES = ['handle_disembarking', 'generate_arrivals', 'handle_boarding',
+          'move_elevators', 'update_wait_times']
+
+
+def run_timed(simulation: Simulation, num_rounds: int) -> dict[str, float]:
+    """Run simulation for num_rounds rounds like Simulation.run does, and
+    return the total time in seconds spent in each of its stages.
+
+    The simulation's statistics are not calculated.
+    """
+    seconds = {stage: 0.0 for stage in STAGES}
+    stages = [(stage, getattr(simulation, stage)) for stage in STAGES]
+    simulation.num_rounds = num_rounds
+    for round_num in range(num_rounds):
+        for stage, method in stages:
+            start = time.perf_counter()
+            if stage == 'generate_arrivals':
+                method(round_num)
+            else:
+                method()
+            seconds[stage] += time.perf_counter() - start
+    return seconds
+
+
+###############################################################################
+# Contract checking
+###############################################################################
+def contracts_config() -> dict[str, Any]:
+    """Return the configuration used by the contract checking benchmark."""
+    num_floors = 10
+    return {
+        'num_floors': num_floors,
+        'num_elevators': 4,
+        'elevator_capacity': 4,
+        'arrival_generator': SingleArrivals(num_floors),
+        'moving_algorithm': FurthestFloor(),
+        'visualize': False
+    }
+
+
+def time_rounds(num_rounds: int) -> dict[str, Any]:
+    """Run the contract checking benchmark configuration for num_rounds rounds
+    in this process, and return its timing and statistics.
+
+    Whether contracts are checked depends on the mode this process imported
+    the simulation modules in (see a1_contracts).
+    """
+    simulation = Simulation(contracts_config())
+    start = time.perf_counter()
+    stats = simulation.run(num_rounds)
+    seconds = time.perf_counter() - start
+    return {
+        'production': is_production_mode(),
+        'num_rounds': num_rounds,
+        'seconds': seconds,
+        'seconds_per_round': seconds / num_rounds,
+        'stats': stats
+    }
+
+
+def time_rounds_in_subprocess(num_rounds: int,
+                              production: bool) -> dict[str, Any]:
+    """Return the result of time_rounds(num_rounds), run in a fresh Python
+    process with production mode turned on or off.
+
+    A fresh process is needed because contract wrappers are installed when
+    the simulation modules are first imported.
+    """
+    env = dict(os.environ)
+    env[PRODUCTION_ENV_VAR] = '1' if production else '0'
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), 'rounds',
+         '--rounds', str(num_rounds)],
+        env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def benchmark_contracts(num_rounds: int) -> dict[str, Any]:
+    """Compare the per-round cost of a run with and without contract
+    checking.
+    """
+    checked = time_rounds_in_subprocess(num_rounds, production=False)
+    production = time_rounds_in_subprocess(num_rounds, production=True)
+    return {
+        'contracts': checked,
+        'production': production,
+        'speedup': checked['seconds'] / production['seconds'],
+        'same_stats': checked['stats'] == production['stats']
+    }
+
+
+###############################################################################
+# Lobby-heavy arrivals
+###############################################################################
+class LobbyArrivals(ArrivalGenerator):
+    """An arrival generator that adds the same number of people to floor 1
+    every round, with targets cycling through the other floors.
+
+    When more people arrive than the elevators can carry away, the lobby
+    queue grows every round.
+    """
+    _per_round: int
+
+    def __init__(self, max_floor: int, per_round: int) -> None:
+        """Initialize a generator adding per_round people to floor 1 each round.
+
+        Preconditions:
+        - max_floor >= 2
+        - per_round >= 1
+        """
+        ArrivalGenerator.__init__(self, max_floor)
+        self._per_round = per_round
+
+    def generate(self, round_num: int) -> dict[int, list[Person]]:
+        """Return the new arrivals for the simulation at the given round."""
+        first = round_num * self._per_round
+        return {1: [Person(1, 2 + i % (self.max_floor - 1))
+                    for i in range(first, first + self._per_round)]}
+
+
+def benchmark_lobby(num_rounds: int, per_round: int) -> dict[str, Any]:
+    """Time each stage of a simulation whose lobby accumulates thousands of
+    waiting people.
+
+    Two small elevators carry people away far slower than per_round people
+    arrive, so the lobby queue grows to about num_rounds * per_round people.
+    """
+    num_floors = 20
+    config = {
+        'num_floors': num_floors,
+        'num_elevators': 2,
+        'elevator_capacity': 4,
+        'arrival_generator': LobbyArrivals(num_floors, per_round),
+        'moving_algorithm': EndToEndLoop(),
+        'visualize': False
+    }
+    simulation = Simulation(config)
+    seconds = run_timed(simulation, num_rounds)
+    return {
+        'production': is_production_mode(),
+        'num_rounds': num_rounds,
+        'per_round': per_round,
+        'lobby_size': len(simulation.waiting[1]),
+        'seconds': seconds,
+        'seconds_per_arrival': seconds['generate_arrivals']
+        / (num_rounds * per_round)
+    }
+
+
+###############################################################################
+# Command line interface
+###############################################################################
+def main(argv: list[str]) -> None:
+    """Run the benchmark named in argv and print its results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    rounds_parser = subparsers.add_parser(
+        'rounds', help='time the contracts configuration in this process')
+    rounds_parser.add_argument('--rounds', type=int, default=1000)
+
+    contracts_parser = subparsers.add_parser(
+        'contracts', help='compare runs with and without contract checking')
+    contracts_parser.add_argument('--rounds', type=int, default=1000)
+
+    lobby_parser = subparsers.add_parser(
+        'lobby', help='time each stage with a growing lobby queue')
+    lobby_parser.add_argument('--rounds', type=int, default=200)
+    lobby_parser.add_argument('--per-round', type=int, default=50)
+
+    args = parser.parse_args(argv)
+    if args.benchmark == 'rounds':
+        result = time_rounds(args.rounds)
+    elif args.benchmark == 'contracts':
+        result = benchmark_contracts(args.rounds)
+    else:
+        result = benchmark_lobby(args.rounds, args.per_round)
+    print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
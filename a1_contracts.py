@@ -0,0 +1,43 @@
+"""CSC148 Assignment 1 - Contract checking switch
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module Description ===
+
+This file decides whether the classes in a1_entities, a1_algorithms and
+a1_simulation are wrapped by python_ta's check_contracts, which re-validates
+representation invariants and type annotations on every attribute assignment
+and method call.
+
+Contract checking is on by default. To run in production mode (no contract
+wrappers at all), either:
+- set the A1_PRODUCTION environment variable to a non-empty value other
+  than '0', or
+- call set_production_mode(True) BEFORE importing any of the modules above.
+
+Classes are decorated when their module is first imported, so switching modes
+afterwards only affects classes imported later.
+"""
+import os
+
+import python_ta.contracts
+from python_ta.contracts import check_contracts
+
+# The environment variable that turns on production mode.
+PRODUCTION_ENV_VAR = 'A1_PRODUCTION'
+
+
+def set_production_mode(production: bool) -> None:
+    """Set whether classes decorated from now on skip contract checking."""
+    python_ta.contracts.ENABLE_CONTRACT_CHECKING = not production
+
+
+def is_production_mode() -> bool:
+    """Return whether contract checking is currently turned off."""
+    return not python_ta.contracts.ENABLE_CONTRACT_CHECKING
+
+
+if os.environ.get(PRODUCTION_ENV_VAR, '') not in ('', '0'):
+    set_production_mode(True)
@@ -22,10 +22,57 @@ to understand these classes, as well as the abstract methods your classes must
 implement.
 """
 from __future__ import annotations
-from python_ta.contracts import check_contracts
+from typing import Optional
+from a1_contracts import check_contracts
 from a1_visualizer import PersonSprite, ElevatorSprite
 
 
+# Whether new entities are created headless, i.e., without allocating any
+# pygame images or surfaces. See set_headless.
+_ENTITY_MODE = {'headless': False}
+
+
+def set_headless(headless: bool) -> None:
+    """Set whether people and elevators created from now on are headless.
+
+    Headless entities skip every pygame image and surface allocation when they
+    are created. Their sprite state is attached lazily, only if a Visualizer
+    that is actually visualizing adopts them (see PersonSprite.attach_sprite
+    and ElevatorSprite.attach_sprite).
+
+    Simulation.__init__ picks the mode based on its 'visualize' option; call
+    this function yourself before creating an arrival generator that builds
+    its people up front (e.g., FileArrivals).
+    """
+    _ENTITY_MODE['headless'] = headless
+
+
+def is_headless() -> bool:
+    """Return whether people and elevators are currently created headless."""
+    return _ENTITY_MODE['headless']
+
+
+@check_contracts
+class RoundClock:
+    """The number of rounds a simulation has completed so far.
+
+    People who are waiting (on a floor or in an elevator) derive their
+    wait_time from a shared RoundClock, so a simulation only has to advance
+    its clock at the end of each round, rather than update every person.
+
+    Instance Attributes:
+    - rounds: the number of rounds completed
+
+    Representation Invariants:
+    - self.rounds >= 0
+    """
+    rounds: int
+
+    def __init__(self) -> None:
+        """Initialize a clock that has not completed any rounds."""
+        self.rounds = 0
+
+
 @check_contracts
 class Person(PersonSprite):
     """A person in the elevator simulation.
@@ -35,6 +82,10 @@ class Person(PersonSprite):
     - target: the floor this person wants to go to
     - wait_time: the number of rounds this person has been waiting
 
+    While a person's wait time is being tracked by a RoundClock (see
+    start_waiting), wait_time is derived from the clock: it grows by one every
+    time the clock completes a round, without being updated explicitly.
+
     Representation Invariants:
     - self.start >= 1
     - self.target >= 1
@@ -44,6 +95,13 @@ class Person(PersonSprite):
     start: int
     target: int
     wait_time: int
+    # The clock tracking this person's wait time, or None if it is not tracked
+    _clock: Optional[RoundClock]
+    # While tracked: the round this person arrived at, counting the rounds
+    # they had already waited before tracking started
+    _arrival_round: int
+    # While not tracked: this person's wait time
+    _wait_time: int
 
     def __init__(self, start: int, target: int) -> None:
         """Initialize a person with the given start and target floor.
@@ -59,11 +117,65 @@ class Person(PersonSprite):
         This is because the PersonSprite initializer will call
          get_anger_level, which
         should depend on self.wait_time.
+
+        If people are currently created headless (see set_headless), no image
+        is loaded for this person.
         """
         self.start = start
         self.target = target
+        self._clock = None
+        self._arrival_round = 0
         self.wait_time = 0
-        PersonSprite.__init__(self)
+        PersonSprite.__init__(self, _ENTITY_MODE['headless'])
+
+    @property
+    def wait_time(self) -> int:
+        """The number of rounds this person has been waiting."""
+        if self._clock is None:
+            return self._wait_time
+        return self._clock.rounds - self._arrival_round
+
+    @wait_time.setter
+    def wait_time(self, value: int) -> None:
+        """Set the number of rounds this person has been waiting."""
+        if self._clock is None:
+            self._wait_time = value
+        else:
+            self._arrival_round = self._clock.rounds - value
+
+    def start_waiting(self, clock: RoundClock) -> None:
+        """Start deriving this person's wait time from the given clock.
+
+        This person's current wait time is kept, and grows by one for every
+        round the clock completes from now on.
+
+        >>> clock = RoundClock()
+        >>> my_person = Person(1, 5)
+        >>> my_person.start_waiting(clock)
+        >>> clock.rounds += 2
+        >>> my_person.wait_time
+        2
+        """
+        wait_time = self.wait_time
+        self._clock = clock
+        self.wait_time = wait_time
+
+    def stop_waiting(self) -> None:
+        """Stop tracking this person's wait time, freezing it at its current
+        value.
+
+        >>> clock = RoundClock()
+        >>> my_person = Person(1, 5)
+        >>> my_person.start_waiting(clock)
+        >>> clock.rounds += 2
+        >>> my_person.stop_waiting()
+        >>> clock.rounds += 2
+        >>> my_person.wait_time
+        2
+        """
+        wait_time = self.wait_time
+        self._clock = None
+        self.wait_time = wait_time
 
     def get_anger_level(self) -> int:
         """Return this person's anger level.
@@ -144,6 +256,9 @@ class Elevator(ElevatorSprite):
         Elevators always start with a current and target floor of 1,
          and no passengers.
 
+        If elevators are currently created headless (see set_headless), no
+        surface is allocated for this elevator.
+
         Preconditions:
         - capacity > 0
         """
@@ -151,7 +266,7 @@ class Elevator(ElevatorSprite):
         self.current_floor = 1
         self.target_floor = 1
         self.passengers = []
-        ElevatorSprite.__init__(self)
+        ElevatorSprite.__init__(self, _ENTITY_MODE['headless'])
 
     def fullness(self) -> float:
         """Return the fraction that this elevator is filled.
@@ -197,6 +312,6 @@ if __name__ == '__main__':
     # "Ctrl + /" or "⌘ + /".
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['a1_visualizer'],
+        'extra-imports': ['a1_contracts', 'a1_visualizer'],
         'max-line-length': 100
     })
@@ -0,0 +1,259 @@
+"""CSC148 Assignment 1 - Wait time histograms
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module Description ===
+
+This file contains log-bucketed histograms of wait times, used by the
+simulation to report wait time percentiles without keeping every person
+who has reached their target floor.
+
+Wait times 0 to 2 * SUB_BUCKETS - 1 each have their own bucket. Above that,
+every power of two [2^k, 2^(k + 1)) is split into SUB_BUCKETS equal buckets,
+so a percentile is reported to within 1 / SUB_BUCKETS of its true value.
+A histogram never has more than NUM_BUCKETS buckets, however long the
+simulation runs.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from a1_contracts import check_contracts
+
+# The number of buckets every power of two is split into
+SUB_BUCKETS = 8
+# The largest wait time a histogram distinguishes; longer wait times are
+# counted in the last bucket
+MAX_TRACKED_WAIT = 2 ** 32 - 1
+# The default percentiles reported by WaitTimeHistogram.summary
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+_SUB_BUCKET_BITS = SUB_BUCKETS.bit_length() - 1
+
+
+def bucket_index(wait_time: int) -> int:
+    """Return the index of the histogram bucket that counts wait_time.
+
+    Preconditions:
+    - 0 <= wait_time <= MAX_TRACKED_WAIT
+
+    >>> [bucket_index(t) for t in [0, 1, 15, 16, 17, 18, 31, 32, 36]]
+    [0, 1, 15, 16, 16, 17, 23, 24, 25]
+    """
+    shift = wait_time.bit_length() - _SUB_BUCKET_BITS - 1
+    if shift <= 0:
+        return wait_time
+    return shift * SUB_BUCKETS + (wait_time >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Return the smallest and largest wait times counted in the bucket with
+    the given index.
+
+    Preconditions:
+    - 0 <= index < NUM_BUCKETS
+
+    >>> [bucket_bounds(i) for i in [0, 15, 16, 23, 24]]
+    [(0, 0), (15, 15), (16, 17), (30, 31), (32, 35)]
+    """
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    low = (index - shift * SUB_BUCKETS) << shift
+    return low, low + (1 << shift) - 1
+
+
+# The number of buckets needed to count every wait time up to MAX_TRACKED_WAIT
+NUM_BUCKETS = bucket_index(MAX_TRACKED_WAIT) + 1
+
+
+@check_contracts
+class WaitTimeHistogram:
+    """A log-bucketed histogram of wait times (see the module description).
+
+    Histograms can be merged, e.g. to combine the results of several
+    simulation runs.
+
+    Instance Attributes:
+    - count: the number of wait times recorded
+    - total: the sum of the wait times recorded
+    - max_value: the largest wait time recorded, or 0 if there are none
+
+    Representation Invariants:
+    - self.count == sum(self._counts)
+    - self.total >= 0
+    - self.max_value >= 0
+    - len(self._counts) <= NUM_BUCKETS
+    """
+    count: int
+    total: int
+    max_value: int
+    # The number of wait times recorded in each bucket, up to the last
+    # non-empty bucket
+    _counts: list[int]
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0
+        self.max_value = 0
+        self._counts = []
+
+    def record(self, wait_time: int) -> None:
+        """Record one wait time in this histogram.
+
+        Preconditions:
+        - wait_time >= 0
+        """
+        index = bucket_index(min(wait_time, MAX_TRACKED_WAIT))
+        if index >= len(self._counts):
+            self._counts.extend([0] * (index + 1 - len(self._counts)))
+        self._counts[index] += 1
+        self.count += 1
+        self.total += wait_time
+        self.max_value = max(self.max_value, wait_time)
+
+    def merge(self, other: WaitTimeHistogram) -> None:
+        """Add every wait time recorded in other to this histogram."""
+        if len(other._counts) > len(self._counts):
+            self._counts.extend([0] * (len(other._counts) - len(self._counts)))
+        for i, bucket_count in enumerate(other._counts):
+            self._counts[i] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        self.max_value = max(self.max_value, other.max_value)
+
+    def percentile(self, percent: int) -> int:
+        """Return the wait time that percent percent of the recorded wait
+        times are at most.
+
+        The result is the largest wait time in the bucket the percentile falls
+        in (but no more than max_value), so it is never less than the true
+        percentile, and overestimates it by less than 1 / SUB_BUCKETS.
+        Return 0 if no wait times have been recorded.
+
+        Preconditions:
+        - 0 <= percent <= 100
+
+        >>> histogram = WaitTimeHistogram()
+        >>> for wait_time in range(1, 101):
+        ...     histogram.record(wait_time)
+        >>> histogram.percentile(50), histogram.percentile(99)
+        (51, 100)
+        """
+        # The rank (starting at 1) of the wait time to report, rounded up
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for i, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bucket_bounds(i)[1], self.max_value)
+        return 0
+
+    def summary(self, percentiles: Optional[tuple[int, ...]] = None) \
+            -> dict[str, int]:
+        """Return the number of wait times recorded, their maximum, their
+        average (rounded down) and the given percentiles, keyed by name.
+
+        The percentiles default to DEFAULT_PERCENTILES, and are named after
+        their value, e.g. 'p95'.
+
+        >>> histogram = WaitTimeHistogram()
+        >>> for wait_time in [1, 2, 3, 10]:
+        ...     histogram.record(wait_time)
+        >>> histogram.summary((50, 99))
+        {'count': 4, 'max': 10, 'avg': 4, 'p50': 2, 'p99': 10}
+        """
+        if percentiles is None:
+            percentiles = DEFAULT_PERCENTILES
+        result = {
+            'count': self.count,
+            'max': self.max_value,
+            'avg': self.total // self.count if self.count > 0 else 0
+        }
+        for percent in percentiles:
+            result[f'p{percent}'] = self.percentile(percent)
+        return result
+
+
+@check_contracts
+class ODWaitHistograms:
+    """Wait time histograms broken down by origin-destination pair, i.e. by
+    the start and target floor of the people whose wait times are recorded.
+
+    Only pairs with at least one recorded wait time have a histogram, so the
+    memory used depends on the number of floors, not on the number of people.
+
+    Representation Invariants:
+    - all(start != target for start, target in self._histograms)
+    """
+    # A histogram for every (start, target) pair with recorded wait times
+    _histograms: dict[tuple[int, int], WaitTimeHistogram]
+
+    def __init__(self) -> None:
+        """Initialize an empty collection of histograms."""
+        self._histograms = {}
+
+    def record(self, start: int, target: int, wait_time: int) -> None:
+        """Record the wait time of a person who travelled from start to
+        target.
+
+        Preconditions:
+        - start != target
+        - wait_time >= 0
+        """
+        pair = (start, target)
+        if pair not in self._histograms:
+            self._histograms[pair] = WaitTimeHistogram()
+        self._histograms[pair].record(wait_time)
+
+    def merge(self, other: ODWaitHistograms) -> None:
+        """Add every wait time recorded in other to these histograms."""
+        for pair, histogram in other._histograms.items():
+            if pair not in self._histograms:
+                self._histograms[pair] = WaitTimeHistogram()
+            self._histograms[pair].merge(histogram)
+
+    def pairs(self) -> list[tuple[int, int]]:
+        """Return the (start, target) pairs with recorded wait times, in
+        increasing order.
+        """
+        return sorted(self._histograms)
+
+    def histogram(self, start: int, target: int) -> WaitTimeHistogram:
+        """Return the histogram of the wait times of people who travelled from
+        start to target.
+
+        The histogram is empty if no such wait times have been recorded.
+        """
+        return self._histograms.get((start, target), WaitTimeHistogram())
+
+    def overall(self) -> WaitTimeHistogram:
+        """Return a histogram of every recorded wait time, whatever its
+        origin and destination.
+        """
+        result = WaitTimeHistogram()
+        for histogram in self._histograms.values():
+            result.merge(histogram)
+        return result
+
+    def summary(self, percentiles: Optional[tuple[int, ...]] = None) \
+            -> dict[tuple[int, int], dict[str, int]]:
+        """Return the summary (see WaitTimeHistogram.summary) of every
+        (start, target) pair with recorded wait times.
+        """
+        return {pair: self._histograms[pair].summary(percentiles)
+                for pair in self.pairs()}
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'extra-imports': ['a1_contracts'],
+        'max-line-length': 100
+    })
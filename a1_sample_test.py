@@ -12,9 +12,17 @@ Add your own to practice writing tests and to be confident your code is correct.
 
 Note: this file is for support purposes only, and is not part of your submission.
 """
-from a1_entities import Person, Elevator
-from a1_algorithms import SingleArrivals, FileArrivals, EndToEndLoop, FurthestFloor
+import pytest
+
+from a1_entities import Person, Elevator, set_headless
+from a1_algorithms import SingleArrivals, FileArrivals, StreamingFileArrivals, EndToEndLoop, \
+    FurthestFloor
 from a1_simulation import Simulation
+from a1_visualizer import HEADLESS_IMAGE
+from a1_benchmarks import time_rounds_in_subprocess
+from a1_traces import BinaryFileArrivals, convert_csv_to_trace
+from a1_histograms import WaitTimeHistogram
+from a1_sweep import expand_grid, build_config, run_sweep, read_results
 
 
 ###############################################################################
@@ -46,6 +54,30 @@ def test_simulation_initializer_elevators() -> None:
         assert elevator.capacity == 2
 
 
+def test_simulation_headless_skips_sprites() -> None:
+    """Test that a non-visualized simulation creates headless entities."""
+    config = get_example_config()
+    simulation = Simulation(config)
+
+    for elevator in simulation.elevators:
+        assert elevator.image is HEADLESS_IMAGE
+    assert Person(1, 5).image is HEADLESS_IMAGE
+
+    simulation.run(5)
+    set_headless(False)
+
+
+def test_person_images_shared() -> None:
+    """Test that people with the same anger level share one decoded image."""
+    person1 = Person(1, 5)
+    person2 = Person(2, 3)
+    assert person1.image is person2.image
+
+    person2.wait_time = 9
+    person2.refresh_image()
+    assert person1.image is not person2.image
+
+
 ###############################################################################
 # Sample tests for Part 3
 ###############################################################################
@@ -67,6 +99,18 @@ def test_single_arrivals_example() -> None:
     assert actual_targets == expected_targets
 
 
+def test_single_arrivals_generate_range() -> None:
+    """Test that SingleArrivals.generate_range matches generate."""
+    arrival_generator = SingleArrivals(5)
+    arrivals = arrival_generator.generate_range(3, 20)
+
+    assert list(arrivals) == list(range(3, 20))
+    for round_num, new_arrivals in arrivals.items():
+        expected = arrival_generator.generate(round_num)
+        assert list(new_arrivals) == [1]
+        assert new_arrivals[1][0].target == expected[1][0].target
+
+
 def test_end_to_end_loop_floor1() -> None:
     """Test the EndToEndLoop algorithm when there is an elevator on floor 1.
     In this case, the elevator's target floor should be set to the max floor number.
@@ -98,6 +142,64 @@ def test_simple_stats_correct_keys() -> None:
     assert actual == expected
 
 
+def test_boarding_fifo() -> None:
+    """Test that an idle elevator boards the people waiting on its floor in the
+    order they arrived, until it is full.
+    """
+    config = get_example_config()
+    config['num_elevators'] = 1
+    config['arrival_generator'] = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    simulation = Simulation(config)
+    simulation.generate_arrivals(0)  # Four people on floor 1
+    simulation.handle_boarding()
+
+    assert [p.target for p in simulation.elevators[0].passengers] == [2, 3]
+    assert [p.target for p in simulation.waiting[1]] == [4, 5]
+
+
+def test_wait_times_follow_rounds() -> None:
+    """Test that the people still waiting after a 5-round simulation have
+    waited since the round they arrived in.
+    """
+    config = get_example_config()
+    simulation = Simulation(config)
+    simulation.run(5)
+
+    assert simulation.waiting[1]
+    for person in simulation.waiting[1]:
+        arrival_round = person.target - 2  # see SingleArrivals
+        assert person.wait_time == 5 - arrival_round
+
+
+def test_stats_nobody_waiting() -> None:
+    """Test the wait time statistics when nobody is left waiting on a floor."""
+    config = get_example_config()
+    simulation = Simulation(config)
+    stats = simulation.run(1)  # The only person boards straight away
+
+    assert stats['total_people'] == 1
+    assert stats['max_time'] == 0
+    assert stats['avg_time'] == 0
+
+
+def test_simulation_without_retaining_completed() -> None:
+    """Test that a simulation which doesn't retain completed people reports
+    the same statistics, without keeping them in people_left.
+    """
+    config = get_example_config()
+    config['arrival_generator'] = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    expected = Simulation(config).run(15)
+
+    config['arrival_generator'] = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    config['retain_completed'] = False
+    simulation = Simulation(config)
+    actual = simulation.run(15)
+
+    assert actual == expected
+    assert actual['people_completed'] > 0
+    assert simulation.people_left == []
+
+
 def test_simple_stats_num_rounds() -> None:
     """Test the returned num_rounds statistic for a 5-round simulation."""
     config = get_example_config()
@@ -137,6 +239,41 @@ def test_file_arrivals_doctest() -> None:
     assert floor5_person.wait_time == 0
 
 
+def test_streaming_file_arrivals_matches_file_arrivals() -> None:
+    """Test that StreamingFileArrivals generates the same arrivals as
+    FileArrivals, round by round.
+    """
+    file_generator = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    streaming_generator = StreamingFileArrivals(6, 'data/sample_arrivals_ten.csv')
+
+    for round_num in range(15):
+        expected = file_generator.generate(round_num)
+        actual = streaming_generator.generate(round_num)
+        assert {floor: [(p.start, p.target) for p in people]
+                for floor, people in actual.items()} == \
+            {floor: [(p.start, p.target) for p in people]
+             for floor, people in expected.items()}
+
+
+def test_binary_file_arrivals_matches_file_arrivals(tmp_path) -> None:
+    """Test that a converted binary trace generates the same arrivals as
+    FileArrivals on the original CSV file.
+    """
+    trace_filename = str(tmp_path / 'sample_arrivals_ten.a1tr')
+    convert_csv_to_trace('data/sample_arrivals_ten.csv', trace_filename)
+    file_generator = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    binary_generator = BinaryFileArrivals(6, trace_filename)
+
+    for round_num in range(15):
+        expected = file_generator.generate(round_num)
+        actual = binary_generator.generate(round_num)
+        assert {floor: [(p.start, p.target) for p in people]
+                for floor, people in actual.items()} == \
+            {floor: [(p.start, p.target) for p in people]
+             for floor, people in expected.items()}
+    binary_generator.close()
+
+
 def test_furthest_floor_simple() -> None:
     """This test checks the behaviour of the FurthestFloor moving algorithm on a simple example.
     """
@@ -151,6 +288,108 @@ def test_furthest_floor_simple() -> None:
     assert elevator.target_floor == 5
 
 
+###############################################################################
+# Wait time histograms
+###############################################################################
+def test_wait_time_histogram_merge() -> None:
+    """Test that merging histograms is the same as recording every wait time
+    in one histogram.
+    """
+    histogram1 = WaitTimeHistogram()
+    histogram2 = WaitTimeHistogram()
+    combined = WaitTimeHistogram()
+    for wait_time in range(200):
+        (histogram1 if wait_time % 3 else histogram2).record(wait_time)
+        combined.record(wait_time)
+    histogram1.merge(histogram2)
+
+    assert histogram1.summary() == combined.summary()
+    assert combined.summary() == {'count': 200, 'max': 199, 'avg': 99,
+                                  'p50': 103, 'p95': 191, 'p99': 199}
+
+
+def test_simulation_wait_histograms() -> None:
+    """Test that a simulation records the wait time of every completed person,
+    whether or not it retains them.
+    """
+    config = get_example_config()
+    config['arrival_generator'] = FileArrivals(6, 'data/sample_arrivals_ten.csv')
+    simulation = Simulation(config)
+    stats = simulation.run(15)
+
+    histograms = simulation.wait_histograms
+    assert histograms.overall().count == stats['people_completed']
+    for person in simulation.people_left:
+        histogram = histograms.histogram(person.start, person.target)
+        assert histogram.count >= 1
+        assert histogram.max_value >= person.wait_time
+
+
+###############################################################################
+# Array-based simulation engine
+###############################################################################
+@pytest.mark.parametrize('filename', ['data/sample_arrivals.csv',
+                                      'data/sample_arrivals_ten.csv'])
+@pytest.mark.parametrize('moving_algorithm', [EndToEndLoop, FurthestFloor])
+def test_array_simulation_same_stats(filename: str, moving_algorithm: type) -> None:
+    """Test that ArraySimulation reports the same statistics and wait time
+    histograms as Simulation on the sample arrival files.
+    """
+    array_simulation = pytest.importorskip('a1_array_simulation')
+
+    for num_rounds in range(1, 7):
+        config = get_example_config()
+        config['arrival_generator'] = FileArrivals(6, filename)
+        config['moving_algorithm'] = moving_algorithm()
+        simulation = Simulation(config)
+        expected = simulation.run(num_rounds)
+
+        config['arrival_generator'] = FileArrivals(6, filename)
+        config['moving_algorithm'] = moving_algorithm()
+        actual_simulation = array_simulation.ArraySimulation(config)
+        actual = actual_simulation.run(num_rounds)
+        assert actual == expected
+        assert actual_simulation.wait_histograms.summary() == \
+            simulation.wait_histograms.summary()
+
+
+###############################################################################
+# Production mode
+###############################################################################
+def test_production_mode_same_stats() -> None:
+    """Test that turning off contract checking doesn't change the statistics."""
+    checked = time_rounds_in_subprocess(50, production=False)
+    production = time_rounds_in_subprocess(50, production=True)
+
+    assert not checked['production']
+    assert production['production']
+    assert checked['stats'] == production['stats']
+
+
+###############################################################################
+# Parameter sweeps
+###############################################################################
+def test_sweep_resumes(tmp_path) -> None:
+    """Test that a sweep reports the same statistics as running each point
+    directly, and that running it again only runs the missing points.
+    """
+    results_filename = str(tmp_path / 'results.jsonl')
+    points = expand_grid({'num_elevators': [1, 2],
+                          'moving_algorithm': ['EndToEndLoop', 'FurthestFloor'],
+                          'num_rounds': [20]})
+    assert len(list(run_sweep(points[:3], results_filename, processes=2))) == 3
+
+    with open(results_filename, 'a') as results_file:
+        results_file.write('{"point": ')  # An interrupted write
+    assert len(list(run_sweep(points, results_filename, processes=2))) == 1
+
+    results = read_results(results_filename)
+    assert len(results) == 4
+    for result in results:
+        simulation = Simulation(build_config(result['point']))
+        assert result['stats'] == simulation.run(20)
+
+
 ###############################################################################
 # Helpers
 ###############################################################################
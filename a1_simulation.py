@@ -15,14 +15,16 @@ Note that we have provided a fairly comprehensive list of attributes for
 Simulation already. You may add your own *private* attributes, but should not
 modify/remove any of the existing attributes.
 """
-import math
+import heapq
+from collections import deque
 # You MAY import more things from these modules (e.g., additional types from
 # typing), but you may not import from any other modules.
-from typing import Any
-from python_ta.contracts import check_contracts
+from typing import Any, Optional
+from a1_contracts import check_contracts
 
 import a1_algorithms
-from a1_entities import Person, Elevator
+from a1_entities import Person, Elevator, RoundClock, set_headless
+from a1_histograms import ODWaitHistograms
 from a1_visualizer import Direction, Visualizer
 
 
@@ -41,6 +43,15 @@ class Simulation:
         - Each corresponding value is the list of people waiting at that floor
           (could be an empty list)
     - people_left: number of completed people (disembarked from the elevator)
+        (always empty if the simulation was configured not to retain them;
+        see __init__)
+    - wait_histograms: histograms of the wait times of completed people, by
+        start and target floor
+
+    Besides self.waiting, each floor keeps the people waiting there in two
+    FIFO queues, one for people going up and one for people going down, which
+    are used for boarding. So people should only be added to (or removed from)
+    self.waiting by the Simulation methods.
 
     Representation Invariants:
     - len(self.elevators) >= 1
@@ -55,8 +66,28 @@ class Simulation:
     visualizer: Visualizer  # done
     waiting: dict[int, list[Person]]  # done
     people_left: list[Person]
+    wait_histograms: ODWaitHistograms
     num_rounds: int
     total_people: int
+    # Completed rounds; drives the wait times of everyone still in the system
+    _clock: RoundClock
+    # The people waiting on each floor whose target is above (or below) it, in
+    # the order they arrived, each with their arrival number
+    _up_queues: dict[int, deque[tuple[int, Person]]]
+    _down_queues: dict[int, deque[tuple[int, Person]]]
+    # Everyone in self.waiting, for constant-time membership checks
+    _waiting_set: set[Person]
+    # Running statistics, so that _calculate_stats doesn't need to look at
+    # every person. Completed people are counted whether or not they are
+    # retained in self.people_left. For the people in self.waiting, the
+    # rounds they arrived at are counted and summed, with the distinct
+    # rounds also kept in a heap (which may contain stale rounds) to find
+    # the earliest one.
+    _retain_completed: bool
+    _people_completed: int
+    _waiting_rounds: dict[int, int]
+    _waiting_rounds_heap: list[int]
+    _waiting_rounds_sum: int
 
     def __init__(self,
                  config: dict[str, Any]) -> None:
@@ -70,9 +101,25 @@ class Simulation:
 
         A partial implementation has been provided to you; you'll
          need to finish it!
+
+        When config['visualize'] is False, people and elevators created from
+        now on are headless (see a1_entities.set_headless), so no pygame
+        images or surfaces are allocated for them.
+
+        config may also have a 'retain_completed' key (True by default).
+        If it is False, people who reach their target floor are counted, but
+        not kept in self.people_left, so that a long simulation doesn't keep
+        every person it has ever created.
         """
+        set_headless(not config['visualize'])
         self.num_rounds = 0
         self.total_people = 0
+        self._clock = RoundClock()
+        self._retain_completed = config.get('retain_completed', True)
+        self._people_completed = 0
+        self._waiting_rounds = {}
+        self._waiting_rounds_heap = []
+        self._waiting_rounds_sum = 0
         # Initialize the algorithm attributes (this is done for you)
         self.arrival_generator = config['arrival_generator']
         self.moving_algorithm = config['moving_algorithm']
@@ -86,12 +133,18 @@ class Simulation:
 
         self.num_floors = config['num_floors']
         self.people_left = []
+        self.wait_histograms = ODWaitHistograms()
 
         # Initialize self.waiting with empty list
         # of people for each floor (James)
         self.waiting = {}
+        self._waiting_set = set()
+        self._up_queues = {}
+        self._down_queues = {}
         for floor in range(1, self.num_floors + 1):
             self.waiting[floor] = []
+            self._up_queues[floor] = deque()
+            self._down_queues[floor] = deque()
 
         # Initialize the visualizer (this is done for you).
         # Note that this should be executed *after* the other attributes
@@ -160,7 +213,12 @@ class Simulation:
             remaining_passengers = []
             for person in elevator.passengers:
                 if elevator.target_floor == elevator.current_floor:
-                    self.people_left.append(person)
+                    person.stop_waiting()
+                    self._people_completed += 1
+                    self.wait_histograms.record(person.start, person.target,
+                                                person.wait_time)
+                    if self._retain_completed:
+                        self.people_left.append(person)
                     self.visualizer.show_disembarking(person, elevator)
                 else:
                     remaining_passengers.append(person)
@@ -168,33 +226,69 @@ class Simulation:
             elevator.update()
 
     def generate_arrivals(self, round_num: int) -> None:
-        """Generate and visualize new arrivals."""
+        """Generate and visualize new arrivals.
+
+        People who are already waiting (i.e., returned by the arrival
+        generator again) are not added a second time.
+        """
         new_arrival = self.arrival_generator.generate(round_num)
         self.visualizer.show_arrivals(new_arrival)
         for floor in new_arrival:
             for person in new_arrival[floor]:
-                if person not in self.waiting[floor]:
+                if person not in self._waiting_set:
+                    person.start_waiting(self._clock)
+                    self._waiting_set.add(person)
+                    self._count_waiting(person)
                     self.waiting[floor].append(person)
+                    if person.target > floor:
+                        self._up_queues[floor].append(
+                            (self.total_people, person))
+                    else:
+                        self._down_queues[floor].append(
+                            (self.total_people, person))
                     self.total_people += 1
 
     def handle_boarding(self) -> None:
-        """Handle boarding of people and visualize."""
-        for floor in range(1, self.num_floors + 1):
-            waiting_person = self.waiting[floor]
-            for elevator in self.elevators:
-                for person in waiting_person:
-                    if elevator.current_floor == person.start \
-                            and elevator.fullness() < 1.0:
-                        if elevator.current_floor == elevator.target_floor\
-                                or (elevator.current_floor >
-                                    elevator.target_floor and
-                                    elevator.current_floor > person.target) \
-                                or (elevator.current_floor <
-                                    elevator.target_floor and
-                                    elevator.current_floor < person.target):
-                            elevator.add_passenger(person)
-                            waiting_person.remove(person)
-                            self.visualizer.show_boarding(person, elevator)
+        """Handle boarding of people and visualize.
+
+        An elevator going up boards people from the front of its floor's
+        up-bound queue, and an elevator going down from the front of the
+        down-bound queue, until it is full. An idle elevator boards people from
+        both queues, in the order they arrived.
+        """
+        for elevator in self.elevators:
+            boarded = set()
+            for _ in range(elevator.capacity - len(elevator.passengers)):
+                queue = self._boarding_queue(elevator)
+                if queue is None:
+                    break
+                _, person = queue.popleft()
+                self._uncount_waiting(person)
+                elevator.add_passenger(person)
+                boarded.add(person)
+                self.visualizer.show_boarding(person, elevator)
+
+            if boarded:
+                self._waiting_set -= boarded
+                waiting = self.waiting[elevator.current_floor]
+                waiting[:] = [person for person in waiting
+                              if person not in boarded]
+
+    def _boarding_queue(self, elevator: Elevator) \
+            -> Optional[deque[tuple[int, Person]]]:
+        """Return the queue on the given elevator's floor that its next
+        passenger boards from, or None if nobody there can board it.
+        """
+        up = self._up_queues[elevator.current_floor]
+        down = self._down_queues[elevator.current_floor]
+        if elevator.current_floor < elevator.target_floor:
+            return up or None
+        elif elevator.current_floor > elevator.target_floor:
+            return down or None
+        elif up and down:
+            return up if up[0][0] < down[0][0] else down
+        else:
+            return up or down or None
 
     def move_elevators(self) -> None:
         """Update elevator target floors and then move them."""
@@ -219,20 +313,45 @@ class Simulation:
         Note that this includes both people waiting for an elevator AND people
         who are passengers on an elevator. It does not include people who have
         reached their target floor.
+
+        Everyone in the simulation derives their wait time from self._clock
+        (see Person.start_waiting), so this only has to advance the clock.
         """
-        for floor in self.waiting:
-            for person in self.waiting[floor]:
-                person.wait_time += 1
-        for elevator in self.elevators:
-            for person in elevator.passengers:
-                person.wait_time += 1
+        self._clock.rounds += 1
 
     ############################################################################
     # Statistics calculations
     ############################################################################
+    def _count_waiting(self, person: Person) -> None:
+        """Add the given person, who just started waiting on a floor, to the
+        running statistics.
+        """
+        arrival_round = self._clock.rounds - person.wait_time
+        if arrival_round in self._waiting_rounds:
+            self._waiting_rounds[arrival_round] += 1
+        else:
+            self._waiting_rounds[arrival_round] = 1
+            heapq.heappush(self._waiting_rounds_heap, arrival_round)
+        self._waiting_rounds_sum += arrival_round
+
+    def _uncount_waiting(self, person: Person) -> None:
+        """Remove the given person, who is no longer waiting on a floor, from
+        the running statistics.
+        """
+        arrival_round = self._clock.rounds - person.wait_time
+        self._waiting_rounds[arrival_round] -= 1
+        if self._waiting_rounds[arrival_round] == 0:
+            del self._waiting_rounds[arrival_round]
+        self._waiting_rounds_sum -= arrival_round
+
     def _calculate_stats(self) -> dict[str, int]:
         """Report the statistics for the current run of this simulation.
 
+        max_time and avg_time are the maximum and average (rounded down) wait
+        times of the people waiting on a floor, or 0 if nobody is waiting.
+        They are derived from running totals kept as people arrive and board,
+        so this takes constant time (amortized).
+
         Preconditions:
         - This method is only called after the simulation rounds have finished
 
@@ -242,21 +361,22 @@ class Simulation:
         """
         num_rounds = self.num_rounds  # done
         total_people = self.total_people  # done
-        people_completed = len(self.people_left)  # done
-
-        # Max time
-        times = []
-        for floor in self.waiting:
-            for person in self.waiting[floor]:
-                times.append(person.wait_time)
-        times.sort()
-        max_time = times[-1]
-
-        # Average time
-        total_time = 0
-        for item in times:
-            total_time += item
-        avg_time = math.floor(total_time / len(times))
+        people_completed = self._people_completed  # done
+
+        num_waiting = len(self._waiting_set)
+        if num_waiting == 0:
+            max_time = 0
+            avg_time = 0
+        else:
+            # Drop the rounds nobody who arrived at is still waiting
+            heap = self._waiting_rounds_heap
+            while heap[0] not in self._waiting_rounds:
+                heapq.heappop(heap)
+
+            max_time = self._clock.rounds - heap[0]
+            total_time = num_waiting * self._clock.rounds \
+                - self._waiting_rounds_sum
+            avg_time = total_time // num_waiting
 
         return {
             'num_rounds': num_rounds,
@@ -308,8 +428,9 @@ if __name__ == '__main__':
 
     import python_ta
     python_ta.check_all(config={
-        'extra-imports': ['a1_entities', 'a1_visualizer', 'a1_algorithms'],
+        'extra-imports': ['a1_contracts', 'a1_entities', 'a1_visualizer',
+                          'a1_algorithms', 'a1_histograms'],
         'max-nested-blocks': 4,
-        'max-attributes': 10,
+        'max-attributes': 20,
         'max-line-length': 100
     })
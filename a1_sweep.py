@@ -0,0 +1,189 @@
+"""CSC148 Assignment 1 - Parameter sweeps
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module Description ===
+
+This file runs headless simulations for every point of a grid of
+configurations, across a pool of worker processes.
+
+A grid maps the name of each parameter of a sweep point (see
+DEFAULT_POINT) to the list of values to try, and the sweep runs every
+combination of them. Sweep points only contain plain values, so that they can
+be sent to worker processes and written as JSON: the moving algorithm is
+given by its name in a1_algorithms, and the arrivals by 'single' (for
+SingleArrivals) or the name of an arrivals CSV file (for FileArrivals).
+
+Each result is appended to a results file as soon as it is ready, as one line
+of JSON with the point and the statistics of its run. Running a sweep again
+with the same results file skips the points that already have results, so an
+interrupted sweep can be resumed. To run a sweep from the command line, e.g.:
+
+    A1_PRODUCTION=1 python a1_sweep.py grid.json results.jsonl --processes 8
+
+where grid.json contains e.g.
+
+    {"num_elevators": [1, 2, 4], "moving_algorithm": ["EndToEndLoop",
+     "FurthestFloor"], "elevator_capacity": [2, 4, 8]}
+
+Workers check contracts unless A1_PRODUCTION is set (see a1_contracts).
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Iterator, Optional
+
+import a1_algorithms
+from a1_simulation import Simulation
+
+# The values used for the parameters a grid doesn't list
+DEFAULT_POINT = {
+    'num_floors': 6,
+    'num_elevators': 2,
+    'elevator_capacity': 2,
+    'moving_algorithm': 'FurthestFloor',
+    'arrivals': 'single',
+    'num_rounds': 100
+}
+
+# The moving algorithms a sweep point can name
+MOVING_ALGORITHMS = {
+    'EndToEndLoop': a1_algorithms.EndToEndLoop,
+    'FurthestFloor': a1_algorithms.FurthestFloor
+}
+
+
+def expand_grid(grid: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Return every sweep point of the given grid, in a fixed order.
+
+    Parameters missing from grid take their value from DEFAULT_POINT.
+
+    Raise ValueError if grid names a parameter not in DEFAULT_POINT.
+
+    >>> points = expand_grid({'num_elevators': [1, 2], 'num_rounds': [10]})
+    >>> [(p['num_elevators'], p['num_rounds']) for p in points]
+    [(1, 10), (2, 10)]
+    """
+    unknown = set(grid) - set(DEFAULT_POINT)
+    if unknown:
+        raise ValueError(f'unknown sweep parameters: {sorted(unknown)}')
+
+    names = list(DEFAULT_POINT)
+    values = [grid.get(name, [DEFAULT_POINT[name]]) for name in names]
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values)]
+
+
+def point_key(point: dict[str, Any]) -> str:
+    """Return a string identifying the given sweep point, used to recognize
+    points that already have results.
+    """
+    return json.dumps(point, sort_keys=True)
+
+
+def build_config(point: dict[str, Any]) -> dict[str, Any]:
+    """Return the (headless) simulation configuration for the given sweep
+    point.
+
+    Preconditions:
+    - point['moving_algorithm'] in MOVING_ALGORITHMS
+    """
+    num_floors = point['num_floors']
+    if point['arrivals'] == 'single':
+        arrival_generator = a1_algorithms.SingleArrivals(num_floors)
+    else:
+        arrival_generator = a1_algorithms.FileArrivals(num_floors,
+                                                       point['arrivals'])
+    return {
+        'num_floors': num_floors,
+        'num_elevators': point['num_elevators'],
+        'elevator_capacity': point['elevator_capacity'],
+        'arrival_generator': arrival_generator,
+        'moving_algorithm': MOVING_ALGORITHMS[point['moving_algorithm']](),
+        'visualize': False,
+        'retain_completed': False
+    }
+
+
+def run_point(point: dict[str, Any]) -> dict[str, Any]:
+    """Run the simulation for the given sweep point, and return its result:
+    the point, the statistics of the run, and how long it took in seconds.
+    """
+    simulation = Simulation(build_config(point))
+    start = time.perf_counter()
+    stats = simulation.run(point['num_rounds'])
+    return {
+        'point': point,
+        'stats': stats,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def read_results(results_filename: str) -> list[dict[str, Any]]:
+    """Return the results in the given results file, in the order they were
+    written, or [] if it doesn't exist.
+
+    An incomplete last line, left by a sweep that was interrupted while
+    writing it, is removed from the file.
+    """
+    if not os.path.exists(results_filename):
+        return []
+
+    with open(results_filename, 'rb+') as results_file:
+        contents = results_file.read()
+        complete = contents.rfind(b'\n') + 1
+        if complete < len(contents):
+            results_file.truncate(complete)
+    return [json.loads(line)
+            for line in contents[:complete].decode().splitlines() if line]
+
+
+def run_sweep(points: list[dict[str, Any]], results_filename: str,
+              processes: Optional[int] = None) -> Iterator[dict[str, Any]]:
+    """Run every sweep point in points that doesn't already have a result in
+    the given results file, across a pool of the given number of worker
+    processes (by default, one per CPU).
+
+    Each result is appended to the results file, and then yielded, as soon as
+    it is ready, so results are in the order the runs finish in.
+    """
+    done = {point_key(result['point'])
+            for result in read_results(results_filename)}
+    remaining = [point for point in points if point_key(point) not in done]
+    if not remaining:
+        return
+
+    with multiprocessing.Pool(processes) as pool, \
+            open(results_filename, 'a') as results_file:
+        for result in pool.imap_unordered(run_point, remaining):
+            results_file.write(json.dumps(result) + '\n')
+            results_file.flush()
+            yield result
+
+
+def main(argv: list[str]) -> None:
+    """Run the sweep described by argv, printing the number of points run."""
+    parser = argparse.ArgumentParser(
+        description='Run a grid of headless simulations across processes.')
+    parser.add_argument('grid_filename',
+                        help='JSON file mapping parameters to lists of values')
+    parser.add_argument('results_filename',
+                        help='JSON lines file to append results to')
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.grid_filename) as grid_file:
+        points = expand_grid(json.load(grid_file))
+    num_run = sum(1 for _ in run_sweep(points, args.results_filename,
+                                       args.processes))
+    print(f'ran {num_run} of {len(points)} sweep points')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,215 @@
+"""CSC148 Assignment 1 - Binary arrival traces
+
+=== CSC148 Fall 2023 ===
+Department of Computer Science,
+University of Toronto
+
+=== Module Description ===
+
+This file contains a compact binary format for arrival traces, a converter
+from the CSV format used by FileArrivals (see data/), and BinaryFileArrivals,
+an arrival generator that memory-maps a binary trace instead of parsing it.
+
+A binary trace file is laid out as follows, with every number stored
+little-endian:
+
+- A header of TRACE_HEADER_SIZE bytes: the magic bytes TRACE_MAGIC, the
+  format version, the number of rounds with arrivals R and the number of
+  arrivals N (three unsigned 32-bit integers).
+- N fixed-width arrival records, each a (round, start, target) triple of
+  signed 32-bit integers, sorted by round and in file order within a round.
+- Zero padding, up to the next multiple of 8 bytes.
+- The round-offset table: the R round numbers with arrivals, in increasing
+  order, followed by R + 1 record offsets (all signed 64-bit integers).
+  The records for the i-th round are records offsets[i] to offsets[i + 1]
+  (exclusive).
+
+To convert a CSV file from the command line, run e.g.:
+
+    python a1_traces.py data/sample_arrivals.csv sample_arrivals.a1tr
+"""
+import argparse
+import bisect
+import csv
+import mmap
+import struct
+import sys
+from array import array
+from typing import BinaryIO
+
+from a1_contracts import check_contracts
+from a1_algorithms import ArrivalGenerator, group_by_start_floor
+from a1_entities import Person
+
+# The first bytes of every binary trace file
+TRACE_MAGIC = b'A1TR'
+# The version of the binary trace format written by convert_csv_to_trace
+TRACE_VERSION = 1
+
+_HEADER_FORMAT = '<4sIII'
+TRACE_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+# The number of 32-bit integers in one (round, start, target) record
+_RECORD_FIELDS = 3
+
+
+def convert_csv_to_trace(csv_filename: str, trace_filename: str) -> None:
+    """Convert the arrivals CSV file csv_filename into a binary trace file
+    named trace_filename.
+
+    The CSV file is read one line at a time, so it may be larger than memory.
+    Only the round-offset table (one entry per round with arrivals) is kept
+    in memory.
+
+    Raise ValueError if the lines of the CSV file are not sorted by round
+    number, or if a round number appears on more than one line.
+
+    Preconditions:
+    - <csv_filename> refers to a valid CSV file, following the specified
+      format and restrictions from the assignment handout.
+    """
+    rounds = array('q')
+    offsets = array('q', [0])
+    num_records = 0
+
+    with open(csv_filename) as csvfile, open(trace_filename, 'wb') as trace:
+        trace.write(bytes(TRACE_HEADER_SIZE))  # filled in at the end
+
+        for line in csv.reader(csvfile):
+            if not line:
+                continue
+            round_num = int(line[0])
+            if rounds and round_num <= rounds[-1]:
+                raise ValueError(f'{csv_filename}: round {round_num} is out of '
+                                 f'order (after round {rounds[-1]})')
+            records = array('i')
+            for start, target in zip(line[1::2], line[2::2]):
+                records.extend((round_num, int(start), int(target)))
+            if not records:
+                continue
+            _write_little_endian(trace, records)
+            num_records += len(records) // _RECORD_FIELDS
+            rounds.append(round_num)
+            offsets.append(num_records)
+
+        trace.write(bytes(-trace.tell() % 8))
+        _write_little_endian(trace, rounds)
+        _write_little_endian(trace, offsets)
+
+        trace.seek(0)
+        trace.write(struct.pack(_HEADER_FORMAT, TRACE_MAGIC, TRACE_VERSION,
+                                len(rounds), num_records))
+
+
+def _write_little_endian(trace: BinaryIO, numbers: array) -> None:
+    """Write numbers to the binary file trace, in little-endian byte order."""
+    if sys.byteorder != 'little':
+        numbers = array(numbers.typecode, numbers)
+        numbers.byteswap()
+    numbers.tofile(trace)
+
+
+@check_contracts
+class BinaryFileArrivals(ArrivalGenerator):
+    """Generate arrivals from a binary trace file (see the module
+    description).
+
+    The file is memory-mapped rather than read, so opening a trace takes the
+    same time regardless of its size, and concurrent runs on the same trace
+    share the operating system's page cache. Looking up a round is a binary
+    search of the round-offset table; its records are handed out as a
+    zero-copy slice of the mapped file (see round_records).
+
+    Call close once this generator is no longer needed.
+    """
+    _file: BinaryIO
+    _map: mmap.mmap
+    _rounds: memoryview
+    _offsets: memoryview
+    _records: memoryview
+
+    def __init__(self, max_floor: int, filename: str) -> None:
+        """Initialize a new BinaryFileArrivals algorithm from the given binary
+        trace file.
+
+        Raise ValueError if the file is not a binary trace file in the
+        current format, or if this machine is not little-endian (the records
+        can then not be used in place).
+
+        Preconditions:
+        - Every start and target floor in the file is between 1 and max_floor
+        """
+        ArrivalGenerator.__init__(self, max_floor)
+        if sys.byteorder != 'little':
+            raise ValueError('binary traces can only be memory-mapped on '
+                             'little-endian machines')
+
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, num_rounds, num_records = struct.unpack_from(
+            _HEADER_FORMAT, self._map)
+        if magic != TRACE_MAGIC or version != TRACE_VERSION:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f'{filename} is not a version {TRACE_VERSION} '
+                             f'binary trace file')
+
+        view = memoryview(self._map)
+        records_end = TRACE_HEADER_SIZE + num_records * _RECORD_FIELDS * 4
+        table_start = records_end + -records_end % 8
+        offsets_start = table_start + num_rounds * 8
+        self._records = view[TRACE_HEADER_SIZE:records_end].cast('i')
+        self._rounds = view[table_start:offsets_start].cast('q')
+        self._offsets = \
+            view[offsets_start:offsets_start + (num_rounds + 1) * 8].cast('q')
+
+    def round_records(self, round_num: int) -> memoryview:
+        """Return the (round, start, target) records for the given round, as
+        a flat zero-copy view of 32-bit integers into the mapped file.
+
+        The returned view is empty if there are no arrivals at round_num.
+
+        Preconditions:
+        - round_num >= 0
+        """
+        i = bisect.bisect_left(self._rounds, round_num)
+        if i == len(self._rounds) or self._rounds[i] != round_num:
+            return self._records[0:0]
+        return self._records[self._offsets[i] * _RECORD_FIELDS:
+                             self._offsets[i + 1] * _RECORD_FIELDS]
+
+    def generate(self, round_num: int) -> dict[int, list[Person]]:
+        """Return the new arrivals for the simulation at the given round.
+
+        People with the same starting floor are listed in the order they
+        appear in the trace.
+
+        Preconditions:
+        - round_num >= 0
+        """
+        records = self.round_records(round_num)
+        return group_by_start_floor(
+            [Person(start, target)
+             for start, target in zip(records[1::_RECORD_FIELDS],
+                                      records[2::_RECORD_FIELDS])])
+
+    def close(self) -> None:
+        """Unmap and close the trace file."""
+        self._records.release()
+        self._rounds.release()
+        self._offsets.release()
+        self._map.close()
+        self._file.close()
+
+
+def main(argv: list[str]) -> None:
+    """Convert the CSV file named in argv into a binary trace file."""
+    parser = argparse.ArgumentParser(
+        description='Convert an arrivals CSV file into a binary trace file.')
+    parser.add_argument('csv_filename')
+    parser.add_argument('trace_filename')
+    args = parser.parse_args(argv)
+    convert_csv_to_trace(args.csv_filename, args.trace_filename)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
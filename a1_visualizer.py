@@ -40,17 +40,43 @@ class ElevatorSprite(pygame.sprite.Sprite):
     rect: pygame.Rect
     passengers: list[PersonSprite]
 
-    def __init__(self) -> None:
-        """Initialize a new ElevatorSprite."""
+    def __init__(self, headless: bool = False) -> None:
+        """Initialize a new ElevatorSprite.
+
+        If headless is True, no surface is allocated: this sprite uses the
+        shared HEADLESS_IMAGE and HEADLESS_RECT placeholders until
+        attach_sprite is called.
+        """
         super().__init__()
+        self.passengers = []
+        if headless:
+            self.image, self.rect = HEADLESS_IMAGE, HEADLESS_RECT
+            return
         self.image = pygame.Surface([ELEVATOR_WIDTH, ELEVATOR_HEIGHT])
         self.image.fill(GREEN)
         self.image.set_colorkey(WHITE)
         self.rect = self.image.get_rect()
-        self.passengers = []
+
+    def attach_sprite(self) -> None:
+        """Allocate this sprite's surface if it was created headless.
+
+        The current passengers are kept. Does nothing if this sprite already
+        has its own surface.
+        """
+        if self.image is not HEADLESS_IMAGE:
+            return
+        passengers = self.passengers
+        ElevatorSprite.__init__(self)
+        self.passengers = passengers
+        self.update()
 
     def update(self) -> None:
-        """Update this elevator's image based on its fullness."""
+        """Update this elevator's image based on its fullness.
+
+        Does nothing if this sprite is still headless.
+        """
+        if self.image is HEADLESS_IMAGE:
+            return
         pygame.draw.rect(self.image, GREEN,
                          [0, 0, ELEVATOR_WIDTH, ELEVATOR_HEIGHT])
         pygame.draw.rect(self.image, DARK_GREEN,
@@ -88,21 +114,47 @@ class PersonSprite(pygame.sprite.Sprite):
     image: pygame.Surface
     rect: pygame.Rect
 
-    def __init__(self) -> None:
-        """Initialize a new person sprite."""
+    def __init__(self, headless: bool = False) -> None:
+        """Initialize a new person sprite.
+
+        If headless is True, no image is loaded: this sprite uses the shared
+        HEADLESS_IMAGE and HEADLESS_RECT placeholders until attach_sprite is
+        called.
+        """
         super().__init__()
         self.width, self.height = PERSON_WIDTH, PERSON_HEIGHT
+        if headless:
+            self.image, self.rect = HEADLESS_IMAGE, HEADLESS_RECT
+            return
         self.image = self.load_image()
         self.rect = self.image.get_rect()
         self.rect.bottom = 0
         self.rect.centerx = random.randint(-2, 2)
 
+    def attach_sprite(self) -> None:
+        """Load this sprite's image if it was created headless.
+
+        Does nothing if this sprite already has its own image.
+        """
+        if self.image is HEADLESS_IMAGE:
+            PersonSprite.__init__(self)
+
     def load_image(self) -> Any:
         """Load the image for this sprite and redraws it
         Lower indices are happier :)
+
+        The decoded and scaled image is shared through _FIGURE_CACHE, so each
+        figure is only read from disk once per process.
+        """
+        self._anger_level = self.get_anger_level()
+        return _load_figure(self._anger_level, self.width, self.height)
+
+    def refresh_image(self) -> None:
+        """Swap this sprite's image if its anger level changed since the
+        image was last loaded.
         """
-        image = pygame.image.load(FIGURES[self.get_anger_level()])
-        return pygame.transform.scale(image, (self.width, self.height))
+        if self.get_anger_level() != self._anger_level:
+            self.image = self.load_image()
 
     def get_anger_level(self) -> int:
         """Return the anger level of this sprite.
@@ -186,7 +238,7 @@ class Visualizer:
         self._stats_group.add(_StatLine(0, f'Round {round_num}'))
         for sprite in self._sprite_group:
             if isinstance(sprite, PersonSprite):
-                sprite.image = sprite.load_image()
+                sprite.refresh_image()
         self.render()
 
     def render(self) -> None:
@@ -214,6 +266,7 @@ class Visualizer:
         for floor, people in arrivals.items():
             y = self._get_y_of_floor(floor)
             for person in people:
+                person.attach_sprite()
                 person.rect.bottom = y
                 person.rect.centerx = x + random.randint(-3, 3)
                 self._sprite_group.add(person)
@@ -318,6 +371,7 @@ class Visualizer:
             self._sprite_group.add(floor)
 
         for i, elevator in enumerate(elevators):
+            elevator.attach_sprite()
             elevator.rect.centerx =\
                 (i + 1) * WIDTH // (self._num_elevators + 1)
             elevator.rect.bottom = self._total_height() - FLOOR_BORDER_HEIGHT
@@ -368,12 +422,36 @@ FPS = 60
 # Images for people
 FIGURES = [f'images/person{i}.png' for i in range(1, 6)]
 
+# Placeholder image and rect shared by every headless sprite, i.e., one that
+# has not been attached to a visualizer yet. Never draw on or move these!
+HEADLESS_IMAGE = pygame.Surface((0, 0))
+HEADLESS_RECT = HEADLESS_IMAGE.get_rect()
+
 # Fonts
 FONT_HEIGHT = 30
 pygame.init()  # Need to call this before creating a new font
 COMIC_SANS = pygame.font.SysFont('Comic Sans MS', FONT_HEIGHT)
 
 
+# Decoded and scaled person images, keyed by (anger level, width, height).
+# Shared by every PersonSprite in the process; see _load_figure.
+_FIGURE_CACHE = {}
+
+
+def _load_figure(anger_level: int, width: int, height: int) -> pygame.Surface:
+    """Return the person image for the given anger level, scaled to the given
+    dimensions.
+
+    The image is only decoded from disk the first time it is requested.
+    Callers must not draw on the returned surface, since it is shared.
+    """
+    key = (anger_level, width, height)
+    if key not in _FIGURE_CACHE:
+        image = pygame.image.load(FIGURES[anger_level])
+        _FIGURE_CACHE[key] = pygame.transform.scale(image, (width, height))
+    return _FIGURE_CACHE[key]
+
+
 ###############################################################################
 # Private sprite classes (you don't need to worry about these)
 ###############################################################################